@@ -10,3 +10,13 @@ class Config:
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     DEFAULT_MAX_RESULTS = int(os.getenv('DEFAULT_MAX_RESULTS', '10'))
     REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '30'))
+    PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', str(os.cpu_count() or 1)))
+    SSE_MAX_SESSIONS = int(os.getenv('SSE_MAX_SESSIONS', '1000'))
+    SSE_QUEUE_SIZE = int(os.getenv('SSE_QUEUE_SIZE', '64'))
+    SEARCH_CACHE_TTL = float(os.getenv('SEARCH_CACHE_TTL', '60'))
+    SEARCH_CACHE_SIZE = int(os.getenv('SEARCH_CACHE_SIZE', '256'))
+
+    # Valores derivados, calculados uma única vez no import
+    SEARCH_URL = f"{SEARXNG_URL}/search"
+    HEALTH_URL = f"{SEARXNG_URL}/"
+    DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0 (compatible; MCP-SearXNG/1.0)'}
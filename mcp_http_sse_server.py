@@ -7,18 +7,33 @@ Suporta transporte HTTP/SSE (compatível com n8n, Claude Desktop, etc).
 
 import argparse
 import asyncio
-import json
+import codecs
+import io
 import logging
+import multiprocessing
+import re
 import sys
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
 import aiohttp
 import aiohttp_cors
+import orjson
 from aiohttp import web, ClientTimeout
+from selectolax.lexbor import LexborHTMLParser
 
 from config import Config
 
+try:
+    import uvloop
+except ImportError:  # Windows ou uvloop não instalado: loop padrão do asyncio
+    uvloop = None
+
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
@@ -28,6 +43,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger('mcp-searxng')
 
+# Intervalo (s) entre keep-alives nas conexões SSE
+SSE_KEEPALIVE_INTERVAL = 15.0
+
+# Trechos fixos dos eventos SSE, já codificados
+_SSE_KEEPALIVE = b": keep-alive\n\n"
+_SSE_ENDPOINT_PREFIX = b"event: endpoint\ndata: "
+_SSE_MESSAGE_PREFIX = b"event: message\ndata: "
+_SSE_EVENT_END = b"\n\n"
+_SSE_QUEUE_FULL_ERROR = {"error": "Sessão SSE sobrecarregada. Tente novamente"}
+
+# Por quanto tempo (s) o /health reaproveita o último probe ao SearXNG
+_HEALTH_CACHE_TTL = 2.0
+
 # ---------------------------------------------------------------------------
 # Tool Definitions
 # ---------------------------------------------------------------------------
@@ -190,6 +218,255 @@ TOOLS = [
     }
 ]
 
+# TOOLS é estático: serializa uma única vez para o fast path de tools/list
+_TOOLS_LIST_PREFIX = b'{"jsonrpc":"2.0","id":'
+_TOOLS_LIST_SUFFIX = b',"result":{"tools":' + orjson.dumps(TOOLS) + b'}}'
+
+
+def _tools_list_body(request_id) -> bytes:
+    """Monta a resposta de tools/list a partir do payload pré-serializado."""
+    return _TOOLS_LIST_PREFIX + orjson.dumps(request_id) + _TOOLS_LIST_SUFFIX
+
+
+# Parâmetros repassados ao SearXNG quando informados (valores vazios são ignorados)
+_WEB_PASSTHROUGH = ('engines', 'language', 'time_range', 'pageno')
+_NEWS_PASSTHROUGH = ('language', 'time_range', 'pageno')
+_IMAGES_PASSTHROUGH = ('engines', 'language', 'pageno')
+
+# Valores aceitos, validados localmente antes de consultar o SearXNG
+_VALID_CATEGORIES = frozenset({
+    'general', 'news', 'images', 'it', 'science', 'social media',
+    'videos', 'files', 'map', 'music',
+})
+_VALID_TIME_RANGE = frozenset({'day', 'month', 'year'})
+
+
+def _json_response(data, status: int = 200) -> web.Response:
+    """Equivalente a web.json_response, serializando com orjson."""
+    return web.Response(body=orjson.dumps(data), status=status, content_type='application/json')
+
+
+# ---------------------------------------------------------------------------
+# HTML -> Markdown
+# ---------------------------------------------------------------------------
+# Elementos removidos antes da conversão
+_STRIP_TAGS = ['script', 'style', 'nav', 'footer', 'header', 'aside', 'iframe', 'noscript']
+
+# Limite de bytes lidos por página: ~8 bytes de HTML por caractere de saída,
+# com piso de 1 MiB para páginas com muito markup antes do conteúdo e teto
+# fixo de 8 MiB (max_length vem dos argumentos da tool)
+_FETCH_BYTES_PER_CHAR = 8
+_FETCH_MIN_BYTES = 1 << 20
+_FETCH_MAX_BYTES = 8 << 20
+_FETCH_CHUNK_SIZE = 16384
+
+_HEADING_PREFIX = {f'h{n}': '#' * n + ' ' for n in range(1, 7)}
+_INLINE_MARKS = {'b': '**', 'strong': '**', 'i': '_', 'em': '_'}
+_BLOCK_TAGS = frozenset({
+    'p', 'div', 'section', 'article', 'main',
+    'figure', 'form', 'fieldset', 'address',
+})
+# Tags cujo conteúdo é pós-processado ao fechar (precisam de buffer próprio)
+_BUFFERED_TAGS = frozenset({
+    'a', 'li', 'ul', 'ol', 'blockquote', 'table', 'tr', 'td', 'th', 'dl', 'dt', 'dd',
+}) | _INLINE_MARKS.keys() | _HEADING_PREFIX.keys()
+_SKIP_NODES = frozenset({'-comment', 'head', 'template', 'svg', 'select', 'button'})
+
+# Marcadores internos (área de uso privado do Unicode): indentação que não deve
+# ser removida pela normalização de espaços e placeholders de blocos <pre>.
+# Todo texto e atributo vindo do documento passa por _STRIP_MARKERS.
+_INDENT = '\ue001'
+_PRE_MARK = '\ue000'
+_STRIP_MARKERS = str.maketrans('', '', _INDENT + _PRE_MARK)
+
+_RE_SPACES = re.compile(r'\s+')
+_RE_SPACE_RUNS = re.compile(r' {2,}')
+_RE_LINE_EDGES = re.compile(r' *\n *')
+_RE_NEWLINES = re.compile(r'\n{2,}')
+_RE_BLANK_LINES = re.compile(r'\n{3,}')
+# Placeholder de <pre> com o prefixo da linha (indentação de lista / "> " de citação)
+_RE_PRE_PLACEHOLDER = re.compile(r'^([> ]*)' + _PRE_MARK + r'(\d+)' + _PRE_MARK, re.M)
+_RE_HEADING_LINE = re.compile(r'(#{1,6} )([^\n]+)')
+
+
+class _Frame:
+    """Elemento aberto durante a conversão para Markdown."""
+
+    __slots__ = ('tag', 'attrs', 'children', 'parts', 'suffix', 'cells', 'header', 'count', 'marker')
+
+    def __init__(self, tag, children, parts, suffix=''):
+        self.tag = tag
+        self.attrs = None
+        self.children = children
+        self.parts = parts
+        self.suffix = suffix
+        self.cells: list[str] = []
+        self.header = True
+        self.count = 0
+        self.marker = '* '
+
+
+def _wrap_inline(content: str, before: str, after: str) -> str:
+    """Envolve conteúdo inline com marcação, mantendo espaços das bordas por fora."""
+    text = content.strip()
+    if not text or '\n' in text:
+        return content
+    lead = content[:len(content) - len(content.lstrip())]
+    trail = content[len(content.rstrip()):]
+    return f"{lead}{before}{text}{after}{trail}"
+
+
+def _close_frame(frame: _Frame, parent: _Frame) -> None:
+    """Gera o Markdown de um elemento com buffer próprio e o anexa ao pai."""
+    tag = frame.tag
+    content = ''.join(frame.parts)
+
+    if tag in _INLINE_MARKS:
+        mark = _INLINE_MARKS[tag]
+        out = _wrap_inline(content, mark, mark)
+    elif tag == 'a':
+        href = (frame.attrs.get('href') or '').translate(_STRIP_MARKERS)
+        text = content.strip()
+        heading = _RE_HEADING_LINE.fullmatch(text) if href else None
+        if heading:
+            # Link em volta de um título (markup comum de cards): link dentro do título
+            out = f"\n\n{heading.group(1)}[{heading.group(2)}]({href})\n\n"
+        elif href:
+            if '\n' in text:
+                # Link em volta de vários blocos: junta o texto numa linha para manter o href
+                content = content.replace(text, _RE_SPACES.sub(' ', text.replace(_INDENT, '')))
+            out = _wrap_inline(content, '[', f"]({href})")
+        else:
+            out = content
+    elif tag in _HEADING_PREFIX:
+        text = _RE_SPACES.sub(' ', content).strip()
+        out = f"\n\n{_HEADING_PREFIX[tag]}{text}\n\n" if text else ''
+    elif tag in ('td', 'th'):
+        cell = _RE_SPACES.sub(' ', content).strip()
+        if parent.tag == 'tr':
+            parent.cells.append(cell)
+            parent.header = parent.header and tag == 'th'
+            return
+        out = f" {cell} "
+    elif tag == 'tr':
+        if not frame.cells:
+            return
+        out = '\n' + ' | '.join(frame.cells) + '\n'
+        if frame.header:
+            out += ' | '.join('---' for _ in frame.cells) + '\n'
+    elif tag in ('table', 'ul', 'ol', 'dl'):
+        # Linhas/itens consecutivos, sem linha em branco entre eles
+        out = '\n\n' + _RE_NEWLINES.sub('\n', _RE_LINE_EDGES.sub('\n', content).strip()) + '\n\n'
+    elif tag == 'li':
+        body = _RE_NEWLINES.sub('\n', _RE_LINE_EDGES.sub('\n', content).strip())
+        indent = _INDENT * len(frame.marker)
+        lines = body.split('\n')
+        out = '\n' + frame.marker + lines[0] + ''.join(
+            f"\n{indent}{line}" if line else '\n' for line in lines[1:]
+        ) + '\n'
+    elif tag == 'blockquote':
+        body = _RE_BLANK_LINES.sub('\n\n', _RE_LINE_EDGES.sub('\n', content).strip())
+        out = '\n\n' + '\n'.join(f"> {line}" if line else '>' for line in body.split('\n')) + '\n\n'
+    elif tag == 'dt':
+        out = '\n' + _RE_SPACES.sub(' ', content).strip() + '\n'
+    else:  # dd
+        out = '\n' + _INDENT * 4 + _RE_SPACES.sub(' ', content).strip() + '\n'
+
+    parent.parts.append(out)
+
+
+def _render_markdown(root) -> str:
+    """Gera Markdown percorrendo a árvore Lexbor uma única vez, sem re-serializar o HTML."""
+    pre_blocks: list[str] = []
+    done = object()
+    top = _Frame('', root.iter(include_text=True), [])
+    # Pilha explícita (sem recursão): suporta DOMs profundamente aninhados
+    stack = [top]
+    while stack:
+        frame = stack[-1]
+        node = next(frame.children, done)
+        if node is done:
+            stack.pop()
+            if not stack:
+                break
+            if frame.parts is stack[-1].parts:
+                frame.parts.append(frame.suffix)
+            else:
+                _close_frame(frame, stack[-1])
+            continue
+
+        parts = frame.parts
+        tag = node.tag
+        if tag == '-text':
+            parts.append(_RE_SPACES.sub(' ', node.text()).translate(_STRIP_MARKERS))
+            continue
+        if tag in _SKIP_NODES:
+            continue
+        if tag == 'br':
+            parts.append('\n')
+            continue
+        if tag == 'img':
+            attrs = node.attributes
+            src = (attrs.get('src') or '').translate(_STRIP_MARKERS)
+            if src:
+                parts.append(f"![{(attrs.get('alt') or '').translate(_STRIP_MARKERS)}]({src})")
+            continue
+        if tag == 'pre':
+            # Placeholder: o bloco volta intacto depois da normalização de espaços
+            pre_blocks.append(f"```\n{node.text().translate(_STRIP_MARKERS).strip(chr(10))}\n```")
+            parts.append(f"\n\n{_PRE_MARK}{len(pre_blocks) - 1}{_PRE_MARK}\n\n")
+            continue
+        if tag == 'code':
+            parts.append(f"`{node.text().translate(_STRIP_MARKERS)}`")
+            continue
+
+        children = node.iter(include_text=True)
+        if tag in _BUFFERED_TAGS:
+            child = _Frame(tag, children, [])
+            if tag == 'a':
+                child.attrs = node.attributes
+            elif tag == 'li' and frame.tag in ('ul', 'ol'):
+                frame.count += 1
+                child.marker = f"{frame.count}. " if frame.tag == 'ol' else '* '
+        elif tag in _BLOCK_TAGS:
+            parts.append('\n\n')
+            child = _Frame(tag, children, parts, '\n\n')
+        else:
+            child = _Frame(tag, children, parts)
+        stack.append(child)
+
+    markdown = _RE_SPACE_RUNS.sub(' ', ''.join(top.parts))
+    markdown = _RE_LINE_EDGES.sub('\n', markdown)
+    markdown = _RE_BLANK_LINES.sub('\n\n', markdown).replace(_INDENT, ' ')
+
+    def restore_pre(match) -> str:
+        prefix = match.group(1)
+        return '\n'.join(
+            prefix + line if line else prefix.rstrip()
+            for line in pre_blocks[int(match.group(2))].split('\n')
+        )
+
+    markdown = _RE_PRE_PLACEHOLDER.sub(restore_pre, markdown)
+    # Placeholders fora do início da linha (ex.: dentro de célula de tabela)
+    return re.sub(_PRE_MARK + r'(\d+)' + _PRE_MARK, lambda m: pre_blocks[int(m.group(1))], markdown)
+
+
+def _html_to_markdown(html: str, max_length: int) -> str:
+    """Converte HTML em Markdown limpo, truncando em max_length caracteres."""
+    tree = LexborHTMLParser(html)
+    # Remove elementos desnecessários
+    tree.strip_tags(_STRIP_TAGS)
+    root = tree.body or tree.root
+    if root is None:
+        return ''
+    markdown = _render_markdown(root)
+
+    # Truncar se necessário
+    if len(markdown) > max_length:
+        markdown = markdown[:max_length] + "\n\n... (conteúdo truncado)"
+
+    return markdown.strip()
+
 
 # ---------------------------------------------------------------------------
 # MCPSearXNGServer
@@ -209,6 +486,17 @@ class MCPSearXNGServer:
         }
         # SSE sessions: session_id -> asyncio.Queue
         self._sse_sessions: dict[str, asyncio.Queue] = {}
+        # session_id -> task do handler SSE (ordem de inserção = mais antiga primeiro)
+        self._sse_tasks: dict[str, asyncio.Task] = {}
+        # Cache LRU de buscas: chave dos params -> (instante, resposta do SearXNG)
+        self._search_cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        # Último probe do /health: (instante, SearXNG acessível)
+        self._health_cache: tuple[float, bool] | None = None
+        # Timestamp ISO do /health, recalculado no máximo uma vez por segundo
+        self._ts_cache_sec = -1
+        self._ts_cache_str = ''
+        # Pool de processos para o parsing de HTML (CPU-bound)
+        self._parse_pool: ProcessPoolExecutor | None = None
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -216,14 +504,37 @@ class MCPSearXNGServer:
     async def start_session(self):
         """Inicializa a sessão HTTP."""
         timeout = ClientTimeout(total=Config.REQUEST_TIMEOUT)
-        self.session = aiohttp.ClientSession(timeout=timeout)
+        connector = aiohttp.TCPConnector(
+            limit=200,
+            limit_per_host=50,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(
+            timeout=timeout,
+            connector=connector,
+            headers=Config.DEFAULT_HEADERS
+        )
+        self._parse_pool = self._new_parse_pool()
         logger.info(f"Sessão HTTP iniciada. SearXNG URL: {Config.SEARXNG_URL}")
 
+    def _new_parse_pool(self) -> ProcessPoolExecutor:
+        """Cria o pool de processos usado na conversão HTML -> Markdown."""
+        # 'spawn' evita herdar locks/threads do processo com o event loop rodando
+        return ProcessPoolExecutor(
+            max_workers=Config.PARSE_WORKERS,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+
     async def close_session(self):
         """Fecha a sessão HTTP."""
         if self.session:
             await self.session.close()
             logger.info("Sessão HTTP encerrada.")
+        if self._parse_pool:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._parse_pool = None
 
     # ------------------------------------------------------------------
     # SearXNG API
@@ -231,58 +542,74 @@ class MCPSearXNGServer:
     async def _searxng_search(self, params: dict) -> dict:
         """Executa busca no SearXNG e retorna JSON."""
         params['format'] = 'json'
-        url = f"{Config.SEARXNG_URL}/search"
+
+        # Buscas idênticas recentes são servidas da memória
+        key = tuple(sorted((k, str(v)) for k, v in params.items()))
+        cached = self._search_cache.get(key)
+        if cached and time.monotonic() - cached[0] < Config.SEARCH_CACHE_TTL:
+            self._search_cache.move_to_end(key)
+            return cached[1]
+
         try:
-            async with self.session.get(url, params=params) as resp:
+            async with self.session.get(Config.SEARCH_URL, params=params) as resp:
                 if resp.status != 200:
                     text = await resp.text()
                     return {"error": f"SearXNG retornou status {resp.status}: {text}"}
-                return await resp.json()
+                data = await resp.json(loads=orjson.loads)
         except asyncio.TimeoutError:
             return {"error": "Timeout ao conectar com SearXNG"}
         except Exception as e:
             return {"error": f"Erro ao conectar com SearXNG: {str(e)}"}
 
+        if Config.SEARCH_CACHE_TTL > 0:
+            self._search_cache[key] = (time.monotonic(), data)
+            self._search_cache.move_to_end(key)
+            while len(self._search_cache) > Config.SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        return data
+
     async def _fetch_url(self, url: str, max_length: int = 20000) -> str:
         """Busca conteúdo de uma URL e converte para Markdown."""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (compatible; MCP-SearXNG/1.0)'
-            }
-            async with self.session.get(url, headers=headers, allow_redirects=True) as resp:
+            async with self.session.get(url, allow_redirects=True) as resp:
                 if resp.status != 200:
                     return f"Erro ao acessar URL: status {resp.status}"
                 content_type = resp.headers.get('Content-Type', '')
                 if 'text/html' not in content_type and 'text/plain' not in content_type:
                     return f"Tipo de conteúdo não suportado: {content_type}"
-                html = await resp.text()
+
+                # Lê em blocos e para ao atingir o limite, sem bufferizar a página inteira
+                max_bytes = min(max(max_length * _FETCH_BYTES_PER_CHAR, _FETCH_MIN_BYTES), _FETCH_MAX_BYTES)
+                buf = bytearray()
+                async for chunk in resp.content.iter_chunked(_FETCH_CHUNK_SIZE):
+                    buf.extend(chunk)
+                    if len(buf) >= max_bytes:
+                        break
+                # Charset desconhecido pelo Python (ex.: utf8mb4) cai para UTF-8, como no aiohttp
+                charset = resp.charset or 'utf-8'
+                try:
+                    codecs.lookup(charset)
+                except LookupError:
+                    charset = 'utf-8'
+                html = buf.decode(charset, errors='replace')
         except asyncio.TimeoutError:
             return "Timeout ao acessar a URL"
         except Exception as e:
             return f"Erro ao acessar URL: {str(e)}"
 
+        # Parsing é CPU-bound: roda no pool de processos, fora do event loop
+        loop = asyncio.get_running_loop()
+        pool = self._parse_pool
         try:
-            from bs4 import BeautifulSoup
-            import html2text
-
-            soup = BeautifulSoup(html, 'html.parser')
-            # Remove elementos desnecessários
-            for tag in soup(['script', 'style', 'nav', 'footer', 'header',
-                             'aside', 'iframe', 'noscript']):
-                tag.decompose()
-
-            h = html2text.HTML2Text()
-            h.ignore_links = False
-            h.ignore_images = False
-            h.ignore_emphasis = False
-            h.body_width = 0  # sem word wrap
-            markdown = h.handle(str(soup))
-
-            # Truncar se necessário
-            if len(markdown) > max_length:
-                markdown = markdown[:max_length] + "\n\n... (conteúdo truncado)"
-
-            return markdown.strip()
+            return await loop.run_in_executor(pool, _html_to_markdown, html, max_length)
+        except BrokenProcessPool:
+            # Um worker morreu (ex.: OOM): recria o pool para as próximas chamadas.
+            # Sem retry: a própria página pode ser a causa e derrubaria o pool novo.
+            if self._parse_pool is pool:
+                logger.warning("Pool de parsing quebrado; recriando")
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._parse_pool = self._new_parse_pool()
+            return "Erro ao processar HTML: processo de conversão encerrado inesperadamente"
         except Exception as e:
             return f"Erro ao processar HTML: {str(e)}"
 
@@ -291,7 +618,8 @@ class MCPSearXNGServer:
     # ------------------------------------------------------------------
     async def execute_tool(self, name: str, arguments: dict) -> dict:
         """Executa uma tool MCP e retorna o resultado."""
-        logger.info(f"Executando tool: {name} | args: {json.dumps(arguments, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Executando tool: %s | args: %s", name, arguments)
 
         try:
             if name == "web_search":
@@ -308,24 +636,26 @@ class MCPSearXNGServer:
             logger.exception(f"Erro ao executar tool {name}")
             return self._error_response(str(e))
 
+    def _validate_search_args(self, categories: str = None, time_range: str = None) -> str | None:
+        """Valida categories/time_range; retorna a mensagem de erro ou None."""
+        if categories and not all(c.strip() in _VALID_CATEGORIES for c in categories.split(',')):
+            return (
+                f"Categoria inválida: {categories}. "
+                f"Válidas: {', '.join(sorted(_VALID_CATEGORIES))}"
+            )
+        if time_range and time_range not in _VALID_TIME_RANGE:
+            return f"Parâmetro 'time_range' inválido: {time_range}. Use day, month ou year"
+        return None
+
     async def _tool_web_search(self, args: dict) -> dict:
         query = args.get('query', '')
         if not query:
             return self._error_response("Parâmetro 'query' é obrigatório")
+        if error := self._validate_search_args(args.get('categories'), args.get('time_range')):
+            return self._error_response(error)
 
-        params = {'q': query}
-        if args.get('categories'):
-            params['categories'] = args['categories']
-        else:
-            params['categories'] = 'general'
-        if args.get('engines'):
-            params['engines'] = args['engines']
-        if args.get('language'):
-            params['language'] = args['language']
-        if args.get('time_range'):
-            params['time_range'] = args['time_range']
-        if args.get('pageno'):
-            params['pageno'] = args['pageno']
+        params = {'q': query, 'categories': args.get('categories') or 'general'}
+        params.update({k: args[k] for k in _WEB_PASSTHROUGH if args.get(k)})
         if args.get('safesearch') is not None:
             params['safesearch'] = args['safesearch']
 
@@ -341,17 +671,12 @@ class MCPSearXNGServer:
         query = args.get('query', '')
         if not query:
             return self._error_response("Parâmetro 'query' é obrigatório")
+        # news_search não aceita categories: só time_range é repassado
+        if error := self._validate_search_args(time_range=args.get('time_range')):
+            return self._error_response(error)
 
-        params = {
-            'q': query,
-            'categories': 'news'
-        }
-        if args.get('language'):
-            params['language'] = args['language']
-        if args.get('time_range'):
-            params['time_range'] = args['time_range']
-        if args.get('pageno'):
-            params['pageno'] = args['pageno']
+        params = {'q': query, 'categories': 'news'}
+        params.update({k: args[k] for k in _NEWS_PASSTHROUGH if args.get(k)})
 
         max_results = args.get('max_results', Config.DEFAULT_MAX_RESULTS)
         data = await self._searxng_search(params)
@@ -366,18 +691,10 @@ class MCPSearXNGServer:
         if not query:
             return self._error_response("Parâmetro 'query' é obrigatório")
 
-        params = {
-            'q': query,
-            'categories': 'images'
-        }
-        if args.get('engines'):
-            params['engines'] = args['engines']
-        if args.get('language'):
-            params['language'] = args['language']
+        params = {'q': query, 'categories': 'images'}
+        params.update({k: args[k] for k in _IMAGES_PASSTHROUGH if args.get(k)})
         if args.get('safesearch') is not None:
             params['safesearch'] = args['safesearch']
-        if args.get('pageno'):
-            params['pageno'] = args['pageno']
 
         max_results = args.get('max_results', Config.DEFAULT_MAX_RESULTS)
         data = await self._searxng_search(params)
@@ -414,21 +731,25 @@ class MCPSearXNGServer:
         answers = data.get('answers', [])
         total = data.get('number_of_results', 0)
 
+        # Texto montado num único buffer; cada bloco após o título começa com "\n"
+        buf = io.StringIO()
+        w = buf.write
+
         tipo = "notícias" if is_news else "web"
-        lines = [f"## Resultados de busca ({tipo}): \"{query}\"\n"]
+        w(f"## Resultados de busca ({tipo}): \"{query}\"\n")
 
         if total:
-            lines.append(f"*Aproximadamente {total:,} resultados encontrados*\n")
+            w(f"\n*Aproximadamente {total:,} resultados encontrados*\n")
 
         # Respostas diretas
         if answers:
-            lines.append("### Respostas diretas\n")
+            w("\n### Respostas diretas\n")
             for ans in answers:
-                lines.append(f"> {ans}\n")
+                w(f"\n> {ans}\n")
 
         # Resultados
         if not results:
-            lines.append("Nenhum resultado encontrado.\n")
+            w("\nNenhum resultado encontrado.\n")
         else:
             for i, r in enumerate(results, 1):
                 title = r.get('title', 'Sem título')
@@ -437,28 +758,27 @@ class MCPSearXNGServer:
                 engines = ', '.join(r.get('engines', []))
                 published = r.get('publishedDate', '')
 
-                lines.append(f"### {i}. [{title}]({url})\n")
+                w(f"\n### {i}. [{title}]({url})\n")
                 if snippet:
-                    lines.append(f"{snippet}\n")
-                meta = []
-                if engines:
-                    meta.append(f"Fontes: {engines}")
-                if published:
-                    meta.append(f"Data: {published}")
-                if meta:
-                    lines.append(f"*{' | '.join(meta)}*\n")
+                    w(f"\n{snippet}\n")
+                if engines and published:
+                    w(f"\n*Fontes: {engines} | Data: {published}*\n")
+                elif engines:
+                    w(f"\n*Fontes: {engines}*\n")
+                elif published:
+                    w(f"\n*Data: {published}*\n")
 
         # Sugestões
         if suggestions:
-            lines.append(f"\n### Sugestões relacionadas\n")
+            w("\n\n### Sugestões relacionadas\n")
             for s in suggestions:
-                lines.append(f"- {s}")
+                w(f"\n- {s}")
 
         return {
             "content": [
                 {
                     "type": "text",
-                    "text": '\n'.join(lines)
+                    "text": buf.getvalue()
                 }
             ],
             "isError": False
@@ -467,31 +787,33 @@ class MCPSearXNGServer:
     def _format_image_results(self, data: dict, max_results: int, query: str) -> dict:
         results = data.get('results', [])[:max_results]
 
-        lines = [f"## Resultados de imagens: \"{query}\"\n"]
+        buf = io.StringIO()
+        w = buf.write
+
+        w(f"## Resultados de imagens: \"{query}\"\n")
 
         if not results:
-            lines.append("Nenhuma imagem encontrada.\n")
+            w("\nNenhuma imagem encontrada.\n")
         else:
             for i, r in enumerate(results, 1):
                 title = r.get('title', 'Sem título')
                 img_url = r.get('img_src', r.get('url', ''))
-                thumb = r.get('thumbnail_src', '')
                 source = r.get('source', r.get('url', ''))
                 engines = ', '.join(r.get('engines', []))
 
-                lines.append(f"### {i}. {title}\n")
+                w(f"\n### {i}. {title}\n")
                 if img_url:
-                    lines.append(f"![{title}]({img_url})\n")
+                    w(f"\n![{title}]({img_url})\n")
                 if source:
-                    lines.append(f"Fonte: {source}\n")
+                    w(f"\nFonte: {source}\n")
                 if engines:
-                    lines.append(f"*Engine: {engines}*\n")
+                    w(f"\n*Engine: {engines}*\n")
 
         return {
             "content": [
                 {
                     "type": "text",
-                    "text": '\n'.join(lines)
+                    "text": buf.getvalue()
                 }
             ],
             "isError": False
@@ -543,7 +865,7 @@ class MCPSearXNGServer:
 
     async def handle_jsonrpc(self, body: dict) -> dict:
         method = body.get('method', '')
-        request_id = body.get('id', str(uuid.uuid4()))
+        request_id = body.get('id')
         params = body.get('params', {})
 
         if method == 'initialize':
@@ -567,37 +889,60 @@ class MCPSearXNGServer:
     # ------------------------------------------------------------------
     # HTTP Handlers
     # ------------------------------------------------------------------
-    async def handle_health(self, request):
-        """Health check endpoint."""
+    def _utc_timestamp(self) -> str:
+        """Timestamp ISO (UTC) com resolução de segundos, em cache por segundo."""
+        now = int(time.time())
+        if now != self._ts_cache_sec:
+            self._ts_cache_sec = now
+            self._ts_cache_str = datetime.utcfromtimestamp(now).isoformat()
+        return self._ts_cache_str
+
+    async def _searxng_reachable(self) -> bool:
+        """Verifica o SearXNG com HEAD, reaproveitando o resultado por alguns segundos."""
+        if self._health_cache and time.monotonic() - self._health_cache[0] < _HEALTH_CACHE_TTL:
+            return self._health_cache[1]
+
         healthy = False
         try:
-            async with self.session.get(f"{Config.SEARXNG_URL}/") as resp:
+            async with self.session.head(Config.HEALTH_URL, allow_redirects=True) as resp:
                 healthy = resp.status == 200
         except Exception:
             pass
 
+        self._health_cache = (time.monotonic(), healthy)
+        return healthy
+
+    async def handle_health(self, request):
+        """Health check endpoint."""
+        healthy = await self._searxng_reachable()
+
         status_code = 200 if healthy else 503
-        return web.json_response({
+        return _json_response({
             "status": "ok" if healthy else "degraded",
             "server": self.server_info,
             "searxng_url": Config.SEARXNG_URL,
             "searxng_reachable": healthy,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": self._utc_timestamp()
         }, status=status_code)
 
     async def handle_mcp_post(self, request):
         """JSON-RPC endpoint (direto)."""
         try:
-            body = await request.json()
+            body = orjson.loads(await request.read())
         except Exception:
-            return web.json_response({
+            return _json_response({
                 "jsonrpc": "2.0",
                 "id": None,
                 "error": {"code": -32700, "message": "Parse error"}
             }, status=400)
 
+        # Fast path: tools/list usa o payload em cache, sem re-serializar TOOLS
+        if body.get('method') == 'tools/list':
+            request_id = body.get('id')
+            return web.Response(body=_tools_list_body(request_id), content_type='application/json')
+
         response = await self.handle_jsonrpc(body)
-        return web.json_response(response)
+        return _json_response(response)
 
     # ------------------------------------------------------------------
     # SSE Transport (padrão MCP - compatível com n8n)
@@ -607,11 +952,33 @@ class MCPSearXNGServer:
     #   2. Cliente faz POST /messages?sessionId=xxx com JSON-RPC
     #   3. Servidor responde via SSE stream com evento "message"
     # ------------------------------------------------------------------
+    async def _sse_keepalive(self, response: web.StreamResponse, owner: asyncio.Task):
+        """Envia keep-alive periódico; cancela a sessão SSE se o cliente caiu."""
+        try:
+            while True:
+                await asyncio.sleep(SSE_KEEPALIVE_INTERVAL)
+                await response.write(_SSE_KEEPALIVE)
+        except (ConnectionResetError, ConnectionAbortedError):
+            owner.cancel()
+
+    def _evict_sse_session(self, session_id: str):
+        """Remove uma sessão SSE e cancela o handler correspondente."""
+        self._sse_sessions.pop(session_id, None)
+        task = self._sse_tasks.pop(session_id, None)
+        if task:
+            task.cancel()
+        logger.warning(f"Sessão SSE descartada (limite de sessões): {session_id}")
+
     async def handle_sse(self, request):
         """GET /sse - Estabelece conexão SSE e envia o endpoint para POST."""
         session_id = str(uuid.uuid4())
-        queue: asyncio.Queue = asyncio.Queue()
+        # Limita o total de sessões: descarta a mais antiga
+        if len(self._sse_sessions) >= Config.SSE_MAX_SESSIONS:
+            self._evict_sse_session(next(iter(self._sse_sessions)))
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=Config.SSE_QUEUE_SIZE)
         self._sse_sessions[session_id] = queue
+        self._sse_tasks[session_id] = asyncio.current_task()
 
         logger.info(f"Nova sessão SSE: {session_id}")
 
@@ -625,26 +992,29 @@ class MCPSearXNGServer:
                 'X-Accel-Buffering': 'no',
             }
         )
-        await response.prepare(request)
+        keepalive_task = None
+        try:
+            await response.prepare(request)
 
-        # Envia o endpoint para o cliente postar mensagens
-        endpoint_url = f"/messages?sessionId={session_id}"
-        await response.write(f"event: endpoint\ndata: {endpoint_url}\n\n".encode('utf-8'))
+            # Envia o endpoint para o cliente postar mensagens
+            endpoint_url = f"/messages?sessionId={session_id}"
+            await response.write(_SSE_ENDPOINT_PREFIX + endpoint_url.encode('ascii') + _SSE_EVENT_END)
+
+            # Keep-alive roda em task separada; o loop principal só acorda com mensagens
+            keepalive_task = asyncio.create_task(
+                self._sse_keepalive(response, asyncio.current_task())
+            )
 
-        try:
             while True:
-                try:
-                    # Espera mensagem na fila (com timeout p/ detectar desconexão)
-                    message = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    data = json.dumps(message, ensure_ascii=False)
-                    await response.write(f"event: message\ndata: {data}\n\n".encode('utf-8'))
-                except asyncio.TimeoutError:
-                    # Envia keep-alive
-                    await response.write(": keep-alive\n\n".encode('utf-8'))
+                message = await queue.get()
+                await response.write(_SSE_MESSAGE_PREFIX + orjson.dumps(message) + _SSE_EVENT_END)
         except (ConnectionResetError, ConnectionAbortedError, asyncio.CancelledError):
             logger.info(f"Sessão SSE encerrada: {session_id}")
         finally:
+            if keepalive_task:
+                keepalive_task.cancel()
             self._sse_sessions.pop(session_id, None)
+            self._sse_tasks.pop(session_id, None)
 
         return response
 
@@ -652,26 +1022,35 @@ class MCPSearXNGServer:
         """POST /messages?sessionId=xxx - Recebe JSON-RPC e responde via SSE."""
         session_id = request.query.get('sessionId', '')
         if not session_id or session_id not in self._sse_sessions:
-            return web.json_response(
+            return _json_response(
                 {"error": "Sessão SSE não encontrada. Conecte primeiro em GET /sse"},
                 status=400
             )
 
         try:
-            body = await request.json()
+            body = orjson.loads(await request.read())
         except Exception:
-            return web.json_response(
+            return _json_response(
                 {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}},
                 status=400
             )
 
+        # Fila cheia: recusa antes de gastar uma ida ao SearXNG / fetch
+        queue = self._sse_sessions.get(session_id)
+        if queue and queue.full():
+            return _json_response(_SSE_QUEUE_FULL_ERROR, status=503)
+
         # Processa e envia resposta pela fila SSE
         response = await self.handle_jsonrpc(body)
         queue = self._sse_sessions.get(session_id)
         if queue:
-            await queue.put(response)
+            try:
+                queue.put_nowait(response)
+            except asyncio.QueueFull:
+                # A fila pode ter enchido enquanto a chamada rodava
+                return _json_response(_SSE_QUEUE_FULL_ERROR, status=503)
 
-        return web.json_response({"status": "accepted"}, status=202)
+        return _json_response({"status": "accepted"}, status=202)
 
     # ------------------------------------------------------------------
     # App Factory
@@ -724,6 +1103,8 @@ def main():
     logger.info(f"Endpoints: /health, /mcp, /sse, /messages")
     logger.info(f"Tools: {', '.join(t['name'] for t in TOOLS)}")
 
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     web.run_app(app, host=args.host, port=args.port)
 
 
@@ -6,12 +6,18 @@ Compatível com Claude Desktop e outros clientes MCP que usam stdio.
 """
 
 import asyncio
-import json
 import logging
 import sys
 
+import orjson
+
 from mcp_http_sse_server import MCPSearXNGServer
 
+try:
+    import uvloop
+except ImportError:  # Windows ou uvloop não instalado: loop padrão do asyncio
+    uvloop = None
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -39,15 +45,15 @@ async def read_message(reader) -> dict | None:
         return None
 
     data = await reader.readexactly(content_length)
-    return json.loads(data.decode('utf-8'))
+    return orjson.loads(data)
 
 
 def write_message(message: dict):
     """Escreve uma mensagem JSON-RPC via Content-Length framing."""
-    data = json.dumps(message, ensure_ascii=False)
-    encoded = data.encode('utf-8')
-    sys.stdout.buffer.write(f"Content-Length: {len(encoded)}\r\n\r\n".encode('utf-8'))
-    sys.stdout.buffer.write(encoded)
+    encoded = orjson.dumps(message)
+    header = f"Content-Length: {len(encoded)}\r\n\r\n".encode('ascii')
+    # Cabeçalho + corpo num único write (uma syscall no flush)
+    sys.stdout.buffer.write(header + encoded)
     sys.stdout.buffer.flush()
 
 
@@ -57,7 +63,7 @@ async def main():
 
     reader = asyncio.StreamReader()
     protocol = asyncio.StreamReaderProtocol(reader)
-    await asyncio.get_event_loop().connect_read_pipe(lambda: protocol, sys.stdin)
+    await asyncio.get_running_loop().connect_read_pipe(lambda: protocol, sys.stdin)
 
     logger.info("MCP SearXNG Stdio Server iniciado")
 
@@ -76,4 +82,6 @@ async def main():
 
 
 if __name__ == '__main__':
+    if uvloop:
+        uvloop.install()
     asyncio.run(main())